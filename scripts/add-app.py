@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Interactively add a new application entry to src/applications.json.
+
+Walks the maintainer through the handful of fields an Obtainium entry
+needs (URL, source, id, categories, track-only), previews the generated
+entry and appends it to the app list on confirmation.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from constants import CATEGORIES, source_for_url
+from utils import REPO_ROOT, load_dotenv, stringify_additional_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = json.loads if orjson is None else orjson.loads
+
+APPLICATIONS_JSON = REPO_ROOT / "src" / "applications.json"
+
+_GITHUB_RE = re.compile(r"https?://github\.com/([^/]+)/([^/]+)")
+
+# Mirrors the additionalSettings blob Obtainium writes for a GitHub source.
+BASE_ADDITIONAL_SETTINGS = {
+    "includePrereleases": False,
+    "fallbackToOlderReleases": True,
+    "filterReleaseTitlesByRegEx": "",
+    "filterReleaseNotesByRegEx": "",
+    "verifyLatestTag": False,
+    "dontSortReleasesList": False,
+    "useLatestAssetDateAsReleaseDate": False,
+    "trackOnly": False,
+    "versionExtractionRegEx": "",
+    "matchGroupToUse": "",
+    "versionDetection": True,
+    "releaseDateAsVersion": False,
+    "useVersionCodeAsOSVersion": False,
+    "apkFilterRegEx": "",
+    "invertAPKFilter": False,
+    "autoApkFilterByArch": True,
+    "appName": "",
+    "exemptFromBackgroundUpdates": False,
+    "skipUpdateNotifications": False,
+    "about": "",
+}
+
+
+def detect_source(url):
+    """Guess the Obtainium source type from an application URL."""
+    return source_for_url(url) or "HTML"
+
+
+def extract_github_info(url):
+    """Return (owner, repo) for a GitHub URL, or None if it does not match."""
+    m = _GITHUB_RE.match(url)
+    return (m.group(1), m.group(2)) if m else None
+
+
+def prompt(text, default=None):
+    suffix = f" [{default}]" if default else ""
+    value = input(f"{text}{suffix}: ").strip()
+    return value or (default or "")
+
+
+def prompt_yes_no(text, default=False):
+    hint = "Y/n" if default else "y/N"
+    value = input(f"{text} ({hint}): ").strip().lower()
+    if not value:
+        return default
+    return value in ("y", "yes")
+
+
+def select_menu(title, options):
+    """Pick one of *options*; arrow-key menu on a TTY, numbered list otherwise."""
+    if sys.stdout.isatty():
+        try:
+            import curses  # noqa: F401
+
+            return _select_menu_curses(title, options)
+        except Exception:
+            pass
+    return _select_menu_fallback(title, options)
+
+
+def _select_menu_curses(title, options):
+    import curses
+
+    def menu(stdscr):
+        curses.curs_set(0)
+        selected = 0
+        while True:
+            stdscr.erase()
+            stdscr.addstr(0, 0, title)
+            for i, option in enumerate(options):
+                marker = "> " if i == selected else "  "
+                stdscr.addstr(i + 2, 0, f"{marker}{option}")
+            key = stdscr.getch()
+            if key in (curses.KEY_UP, ord("k")):
+                selected = (selected - 1) % len(options)
+            elif key in (curses.KEY_DOWN, ord("j")):
+                selected = (selected + 1) % len(options)
+            elif key in (curses.KEY_ENTER, ord("\n"), ord("\r")):
+                return options[selected]
+
+    return curses.wrapper(menu)
+
+
+def _select_menu_fallback(title, options):
+    print(title)
+    for i, option in enumerate(options, 1):
+        print(f"  {i}. {option}")
+    while True:
+        choice = input(f"Select 1-{len(options)}: ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+
+
+def generate_app_entry(app_id, url, author, name, categories, track_only=False,
+                       allow_id_change=True):
+    """Build a full Obtainium app entry from the prompted fields."""
+    settings = dict(BASE_ADDITIONAL_SETTINGS)
+    if track_only:
+        settings["trackOnly"] = True
+    return {
+        "id": app_id,
+        "url": url,
+        "author": author,
+        "name": name,
+        "latestVersion": None,
+        "apkUrls": "[]",
+        "otherAssetUrls": "[]",
+        "preferredApkIndex": 0,
+        "additionalSettings": stringify_additional_settings(settings),
+        "pinned": False,
+        "categories": categories,
+        "releaseDate": int(time.time() * 1_000_000),
+        "overrideSource": None,
+        "allowIdChange": allow_id_change,
+    }
+
+
+def main():
+    load_dotenv()
+
+    with open(APPLICATIONS_JSON, encoding="utf-8") as f:
+        data = _loads(f.read())
+
+    url = prompt("Application URL")
+    source = detect_source(url)
+    print(f"Detected source: {source}")
+
+    author = ""
+    name = ""
+    if source == "GitHub":
+        info = extract_github_info(url)
+        if info:
+            author, name = info
+
+    author = prompt("Author", default=author)
+    name = prompt("Display name", default=name)
+    app_id = prompt("Application id (package name)")
+
+    duplicate = any(a.get("id") == app_id for a in data.get("apps", ()))
+    if duplicate:
+        print(f"Error: an app with id '{app_id}' already exists.", file=sys.stderr)
+        return 1
+
+    category = select_menu("Category:", CATEGORIES)
+    track_only = category == "Track Only" or prompt_yes_no("Track only (no APK pull)?")
+
+    app_entry = generate_app_entry(
+        app_id, url, author, name, [category], track_only=track_only,
+    )
+
+    print(json.dumps(app_entry, indent=2))
+    if not prompt_yes_no("Add this entry?", default=True):
+        print("Aborted.")
+        return 1
+
+    data.setdefault("apps", []).append(app_entry)
+    if orjson is not None:
+        payload = orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    else:
+        payload = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    with open(APPLICATIONS_JSON, "wb") as f:
+        f.write(payload)
+    # relpath never raises when cwd is outside the repo, unlike
+    # Path.relative_to — it just prints the ../ form.
+    print(f"Added '{name}' to {os.path.relpath(APPLICATIONS_JSON)}.")
+
+    if prompt_yes_no("Run a live test against the new entry?"):
+        try:
+            from importlib import import_module
+
+            test_mod = import_module("test-apps")
+        except ImportError:
+            print("test-apps.py not available; skipping live test.")
+        else:
+            test_mod.test_app(app_entry)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Constants shared by the repo scripts."""
+
+import functools
+import re
+import sys
+from collections import namedtuple
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+# Obtainium deep-link pieces used when generating "add this app" URLs.
+REDIRECT_URL = "https://apps.obtainium.imranr.dev/redirect"
+OBTAINIUM_SCHEME = "obtainium://app/"
+
+CATEGORIES = [
+    "Emulator",
+    "Utilities",
+    "Game Launcher",
+    "Track Only",
+]
+
+VARIANT_OPTIONS = [
+    "stable",
+    "nightly",
+    "canary",
+    "beta",
+]
+
+# Obtainium source types the pack is allowed to reference.
+VALID_SOURCES = frozenset({
+    "GitHub",
+    "GitLab",
+    "Codeberg",
+    "FDroid",
+    "IzzyOnDroid",
+    "SourceForge",
+    "SourceHut",
+    "APKPure",
+    "APKMirror",
+    "HuaweiAppGallery",
+    "GooglePlay",
+    "Steam",
+    "Mullvad",
+    "Signal",
+    "VLC",
+    "WhatsApp",
+    "Telegram",
+    "HTML",
+    "DirectAPKLink",
+})
+
+# Sources whose versions come from tagged releases.
+RELEASE_SOURCES = frozenset({"GitHub", "GitLab", "Codeberg"})
+
+Setting = namedtuple("Setting", ["sources", "is_regex"], defaults=[VALID_SOURCES, False])
+
+# additionalSettings keys Obtainium understands, with the sources each one
+# applies to and whether its value is a regular expression.
+SETTINGS_SCHEMA = {
+    "includePrereleases": Setting(sources=RELEASE_SOURCES),
+    "fallbackToOlderReleases": Setting(sources=RELEASE_SOURCES),
+    "filterReleaseTitlesByRegEx": Setting(sources=RELEASE_SOURCES, is_regex=True),
+    "filterReleaseNotesByRegEx": Setting(sources=RELEASE_SOURCES, is_regex=True),
+    "verifyLatestTag": Setting(sources=RELEASE_SOURCES),
+    "dontSortReleasesList": Setting(sources=RELEASE_SOURCES),
+    "useLatestAssetDateAsReleaseDate": Setting(sources=RELEASE_SOURCES),
+    "releaseDateAsVersion": Setting(sources=RELEASE_SOURCES),
+    "trackOnly": Setting(),
+    "versionExtractionRegEx": Setting(is_regex=True),
+    "matchGroupToUse": Setting(),
+    "versionDetection": Setting(),
+    "useVersionCodeAsOSVersion": Setting(),
+    "apkFilterRegEx": Setting(is_regex=True),
+    "invertAPKFilter": Setting(),
+    "autoApkFilterByArch": Setting(),
+    "appName": Setting(),
+    "shizukuPretendToBeGooglePlay": Setting(),
+    "exemptFromBackgroundUpdates": Setting(),
+    "skipUpdateNotifications": Setting(),
+    "about": Setting(),
+    "intermediateLink": Setting(sources=frozenset({"HTML"})),
+    "intermediateLinkRegex": Setting(sources=frozenset({"HTML"}), is_regex=True),
+    "customLinkFilterRegex": Setting(sources=frozenset({"HTML"}), is_regex=True),
+    "filterByLinkText": Setting(sources=frozenset({"HTML"})),
+    "skipSort": Setting(sources=frozenset({"HTML"})),
+    "reverseSort": Setting(sources=frozenset({"HTML"})),
+    "sortByLastLinkSegment": Setting(sources=frozenset({"HTML"})),
+    "sortByFileNamesNotLinks": Setting(sources=frozenset({"HTML"})),
+    "versionExtractWholePage": Setting(sources=frozenset({"HTML"})),
+    "requestHeader": Setting(sources=frozenset({"HTML"})),
+    "defaultPseudoVersioningMethod": Setting(sources=frozenset({"HTML"})),
+    "supportFixedAPKURL": Setting(sources=frozenset({"HTML"})),
+}
+
+# Intern the schema keys so per-app settings lookups compare by pointer.
+SETTINGS_SCHEMA = {sys.intern(k): v for k, v in SETTINGS_SCHEMA.items()}
+
+# Derived views, all computed in one pass over the schema and frozen.
+_common, _specific, _regex = set(), {s: set() for s in VALID_SOURCES}, set()
+for _key, _setting in SETTINGS_SCHEMA.items():
+    if _setting.sources is VALID_SOURCES:
+        _common.add(_key)
+    else:
+        for _src in _setting.sources:
+            _specific[_src].add(_key)
+    if _setting.is_regex:
+        _regex.add(_key)
+COMMON_SETTINGS_KEYS = frozenset(_common)
+SOURCE_SPECIFIC_KEYS = MappingProxyType({k: frozenset(v) for k, v in _specific.items() if v})
+REGEX_SETTINGS_KEYS = frozenset(_regex)
+del _common, _specific, _regex
+
+# Hostname (or registrable suffix) -> Obtainium source type. Keys are matched
+# against the URL's netloc exactly, then against each parent suffix.
+SOURCE_HOST_MAP = MappingProxyType({
+    "github.com": "GitHub",
+    "gitlab.com": "GitLab",
+    "codeberg.org": "Codeberg",
+    "f-droid.org": "FDroid",
+    "apt.izzysoft.de": "IzzyOnDroid",
+    "sourceforge.net": "SourceForge",
+    "sourcehut.org": "SourceHut",
+    "sr.ht": "SourceHut",
+    "apkpure.com": "APKPure",
+    "apkmirror.com": "APKMirror",
+    "huawei.com": "HuaweiAppGallery",
+    "play.google.com": "GooglePlay",
+    "dolphin-emu.org": "HTML",
+    "buildbot.libretro.com": "HTML",
+    "store.steampowered.com": "Steam",
+    "mullvad.net": "Mullvad",
+    "signal.org": "Signal",
+    "videolan.org": "VLC",
+    "whatsapp.com": "WhatsApp",
+    "telegram.org": "Telegram",
+    "neverssl.com": "HTML",
+})
+
+# Reversed-label trie over SOURCE_HOST_MAP, compiled once at import; lookup
+# walks the URL's host labels right-to-left and keeps the longest match.
+_HOST_TRIE = {}
+for _host, _src in SOURCE_HOST_MAP.items():
+    _node = _HOST_TRIE
+    for _part in reversed(_host.split(".")):
+        _node = _node.setdefault(_part, {})
+    _node["$"] = _src
+del _host, _src, _node, _part
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_setting_regex(pattern):
+    """Compile (and cache) a pattern taken from a REGEX_SETTINGS_KEYS value.
+
+    Validators iterating REGEX_SETTINGS_KEYS must use this instead of calling
+    re.compile directly so each distinct pattern is compiled once per run.
+    """
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=1024)
+def source_for_url(url):
+    """Map *url* to its Obtainium source type, or None if the host is unknown."""
+    host = urlparse(url).netloc.lower().split(":")[0]
+    node = _HOST_TRIE
+    source = None
+    for part in reversed(host.split(".")):
+        node = node.get(part)
+        if node is None:
+            break
+        source = node.get("$", source)
+    return source
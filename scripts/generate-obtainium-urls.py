@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Print an Obtainium redirect link for every app in src/applications.json."""
+
+import sys
+
+from utils import APPLICATIONS_JSON, load_apps, make_obtainium_link
+
+try:
+    import ijson
+except ImportError:  # streaming is optional; fall back to a full load
+    ijson = None
+
+
+def _iter_apps(path):
+    """Yield apps one at a time; streams with ijson when it is available."""
+    if ijson is not None:
+        with open(path, encoding="utf-8") as f:
+            yield from ijson.items(f, "apps.item")
+    else:
+        yield from load_apps(path)
+
+
+# Below this app count, process startup costs more than the encoding saves.
+_PARALLEL_THRESHOLD = 256
+
+
+def main():
+    apps = list(_iter_apps(APPLICATIONS_JSON))
+    if len(apps) > _PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as ex:
+            urls = list(ex.map(make_obtainium_link, apps, chunksize=64))
+    else:
+        urls = [make_obtainium_link(app) for app in apps]
+    sys.stdout.writelines(f"{app['name']}: {url}\n\n" for app, url in zip(apps, urls))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
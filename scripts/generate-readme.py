@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Stitch the markdown sections in src/readme/ into the top-level README.md."""
+
+import sys
+from pathlib import Path
+
+from utils import REPO_ROOT
+
+README_DIR = REPO_ROOT / "src" / "readme"
+README_FILE = REPO_ROOT / "README.md"
+
+
+def stitch_markdown_files(markdown_files, output_file):
+    """Concatenate *markdown_files* into *output_file*, one blank line apart."""
+    parts = []
+    for file in markdown_files:
+        try:
+            parts.append(Path(file).read_bytes().strip())
+        except FileNotFoundError:
+            print(f"File not found: {file}", file=sys.stderr)
+            sys.exit(1)
+    Path(output_file).write_bytes(b"\n\n".join(parts) + b"\n")
+
+
+def main():
+    sections = sorted(README_DIR.glob("*.md"))
+    if not sections:
+        print(f"No markdown sections found in {README_DIR}", file=sys.stderr)
+        return 1
+    stitch_markdown_files(sections, README_FILE)
+    print(f"Wrote {README_FILE} from {len(sections)} sections.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
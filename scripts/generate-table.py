@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Render the per-category application tables (markdown) from src/applications.json."""
+
+import sys
+from operator import itemgetter
+
+from utils import _EMPTY, APPLICATIONS_JSON, include_flags, load_apps, make_obtainium_link
+
+_CHECKMARK = ("❌", "✅")
+
+# Below this app count, worker startup costs more than the encoding saves.
+_PARALLEL_THRESHOLD = 256
+
+try:
+    import ijson
+except ImportError:  # streaming is optional; fall back to a full load
+    ijson = None
+
+
+def _iter_apps(path):
+    """Yield apps one at a time; streams with ijson when it is available."""
+    if ijson is not None:
+        with open(path, encoding="utf-8") as f:
+            yield from ijson.items(f, "apps.item")
+    else:
+        yield from load_apps(path)
+
+
+def get_display_name(app):
+    return (app.get("meta") or _EMPTY).get("displayName") or app.get("name") or app.get("id", "")
+
+
+def generate_category_tables(apps, out):
+    # One pass per app: meta flags, display name, badge and the encoded link
+    # are computed once even when the app appears in several categories.
+    apps = [app for app in apps if not (app.get("meta") or _EMPTY).get("excludeFromTable")]
+    if len(apps) > _PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as ex:
+            links = list(ex.map(make_obtainium_link, apps, chunksize=64))
+    else:
+        links = [make_obtainium_link(app) for app in apps]
+
+    categorized = {}
+    for app, link in zip(apps, links):
+        display_name = get_display_name(app)
+        badge_md = " `TRACK ONLY`" if '"trackOnly":true' in app.get("additionalSettings", "") else ""
+        std, ds = include_flags(app)
+        row = (
+            display_name.lower(),
+            f"| [{display_name}]({app.get('url', '')}){badge_md}"
+            f" | {_CHECKMARK[std]} | {_CHECKMARK[ds]} | [Add]({link}) |\n",
+        )
+        for category in app.get("categories", ["Uncategorized"]):
+            categorized.setdefault(sys.intern(category), []).append(row)
+
+    write = out.write
+    for i, category in enumerate(sorted(categorized)):
+        if i:
+            write("\n")
+        write(
+            f"### {category}\n\n"
+            "| App | Standard | Dual-Screen | Add to Obtainium |\n"
+            "| --- | :---: | :---: | --- |\n"
+        )
+        rows = categorized[category]
+        rows.sort(key=itemgetter(0))
+        for _, rendered in rows:
+            write(rendered)
+
+
+def main():
+    generate_category_tables(_iter_apps(APPLICATIONS_JSON), sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
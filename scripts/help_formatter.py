@@ -0,0 +1,32 @@
+"""ANSI-styled argparse help formatter shared by the CLI scripts."""
+
+import argparse
+import sys
+
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+YELLOW = "\033[33m"
+DIM = "\033[2m"
+BOLD = "\033[1m"
+RESET = "\033[0m"
+
+# Prebuilt wrap template: one C-level format op per use instead of an
+# f-string joining three parts.
+_GREEN_WRAP = GREEN + "%s" + RESET
+
+
+class StyledHelpFormatter(argparse.HelpFormatter):
+    """Colorize option strings when stdout is a tty; plain text otherwise."""
+
+    def __init__(self, prog, **kwargs):
+        super().__init__(prog, **kwargs)
+        self._color = sys.stdout.isatty()
+
+    def _format_action(self, action):
+        text = super()._format_action(action)
+        if not self._color:
+            return text
+        action_header = self._format_action_invocation(action)
+        # Splice the colour codes in after layout, so argparse's len()-based
+        # column math still sees the uncolored header width.
+        return text.replace(action_header, _GREEN_WRAP % action_header, 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Build the minified Obtainium import file from src/applications.json."""
+
+import argparse
+import json
+import sys
+
+from help_formatter import StyledHelpFormatter
+from utils import (
+    APPLICATIONS_JSON,
+    REPO_ROOT,
+    get_additional_settings,
+    should_include_app,
+    stringify_additional_settings,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Default output per variant; these are the artifact names publish-release.py
+# looks for, so exporting dual-screen must never clobber the standard pack.
+DEFAULT_OUTPUTS = {
+    "standard": REPO_ROOT / "obtainium-emulation-pack.json",
+    "dual-screen": REPO_ROOT / "obtainium-emulation-pack-dual-screen.json",
+}
+
+
+def minify_json(input_file, output_file, variant="standard", rewrite_settings=True):
+    """Filter, strip and compact the app list into *output_file*."""
+    with open(input_file, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    # Bind the hot helpers locally; the comprehension's LIST_APPEND path then
+    # runs without any global lookups per app.
+    _include = should_include_app
+    _get_settings = get_additional_settings
+    _stringify = stringify_additional_settings
+
+    def _prep(app):
+        app_copy = {k: v for k, v in app.items() if k != "meta"}
+        if rewrite_settings:
+            app_copy["additionalSettings"] = _stringify(_get_settings(app))
+        return app_copy
+
+    filtered_apps = [_prep(app) for app in data.get("apps", []) if _include(app, variant)]
+    data["apps"] = filtered_apps
+
+    with open(output_file, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(data))
+        else:
+            f.write(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    return len(filtered_apps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=StyledHelpFormatter)
+    parser.add_argument("--variant", choices=("standard", "dual-screen"), default="standard",
+                        help="which device variant of the pack to export")
+    parser.add_argument("--output", default=None,
+                        help="output file (defaults to the root pack for the chosen variant)")
+    parser.add_argument("--no-settings-rewrite", action="store_true",
+                        help="keep each app's additionalSettings string as-is")
+    args = parser.parse_args()
+
+    output_file = args.output or DEFAULT_OUTPUTS[args.variant]
+    count = minify_json(APPLICATIONS_JSON, output_file, args.variant,
+                        rewrite_settings=not args.no_settings_rewrite)
+    print(f"Wrote {count} apps to {output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Rewrite src/applications.json with every app in canonical key order."""
+
+import json
+import sys
+
+from constants import SETTINGS_SCHEMA
+from utils import APPLICATIONS_JSON, get_additional_settings, stringify_additional_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Canonical top-level key order for an app entry (Obtainium's export order).
+# Tuples of interned keys: JSON parsing yields fresh strings, so interning
+# lets the per-app `in d` probes hit pointer equality first.
+KEY_ORDER = tuple(sys.intern(k) for k in (
+    "id",
+    "url",
+    "author",
+    "name",
+    "latestVersion",
+    "apkUrls",
+    "otherAssetUrls",
+    "preferredApkIndex",
+    "additionalSettings",
+    "pinned",
+    "categories",
+    "releaseDate",
+    "overrideSource",
+    "allowIdChange",
+    "meta",
+))
+
+_SETTINGS_KEY_ORDER = tuple(sys.intern(k) for k in SETTINGS_SCHEMA)
+
+_KEY_ORDER_SET = frozenset(KEY_ORDER)
+_SETTINGS_KEY_ORDER_SET = frozenset(_SETTINGS_KEY_ORDER)
+
+
+def _order_dict(d, key_order, allowed=None):
+    """Return *d* with keys in *key_order* first, unknown keys appended after."""
+    if allowed is not None and d.keys() <= allowed:
+        # Common case: no unknown keys, one pass and done.
+        return {k: d[k] for k in key_order if k in d}
+    ordered = {}
+    for key in key_order:
+        if key in d:
+            ordered[key] = d[key]
+    for key, value in d.items():
+        if key not in ordered:
+            ordered[key] = value
+    return ordered
+
+
+def normalize_app(app):
+    """Return (ordered_app, changed); ordering only moves keys, never values."""
+    ordered = _order_dict(app, KEY_ORDER, _KEY_ORDER_SET)
+    changed = list(app) != list(ordered)
+    try:
+        settings = get_additional_settings(app)
+    except ValueError:
+        settings = None  # invalid JSON is validate-json's report, not ours
+    if settings:
+        reordered = _order_dict(settings, _SETTINGS_KEY_ORDER, _SETTINGS_KEY_ORDER_SET)
+        if list(settings) != list(reordered):
+            # Only re-stringify when the order actually moved, so an
+            # already-canonical blob keeps its exact bytes.
+            ordered["additionalSettings"] = stringify_additional_settings(reordered)
+            changed = True
+    return ordered, changed
+
+
+def _dumps_indent(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_normalized(f, data, apps):
+    """Write the document app by app so only one serialized app is in memory."""
+    f.write(b'{\n  "apps": [\n')
+    last = len(apps) - 1
+    for i, app in enumerate(apps):
+        f.write(b"    " + _dumps_indent(app).replace(b"\n", b"\n    "))
+        f.write(b",\n" if i != last else b"\n")
+    f.write(b"  ]")
+    for key, value in data.items():
+        if key == "apps":
+            continue
+        f.write(f',\n  "{key}": '.encode("utf-8"))
+        f.write(_dumps_indent(value).replace(b"\n", b"\n  "))
+    f.write(b"\n}\n")
+
+
+def normalize(path):
+    """Normalize *path* in place; returns how many apps were touched."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    changes = 0
+    normalized_apps = []
+    for app in data.get("apps", []):
+        normalized, changed = normalize_app(app)
+        changes += changed
+        normalized_apps.append(normalized)
+    data["apps"] = normalized_apps
+
+    with open(path, "wb") as f:
+        _write_normalized(f, data, normalized_apps)
+    return changes
+
+
+def main():
+    changes = normalize(APPLICATIONS_JSON)
+    print(f"Normalized {APPLICATIONS_JSON.name}: {changes} app(s) reordered.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
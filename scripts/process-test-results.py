@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""File or close GitHub issues for app test results via the gh CLI."""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+
+from help_formatter import StyledHelpFormatter
+
+FAILURE_LABEL = "automated-test-failure"
+TITLE_PREFIX = "[test-failure] "
+
+# Resolve the binary once instead of re-scanning PATH per invocation.
+_GH = shutil.which("gh") or "gh"
+
+
+def _run_gh(args):
+    """Run a gh CLI command and return its stdout, or None on failure."""
+    result = subprocess.run([_GH, *args], capture_output=True, text=True, close_fds=True)
+    if result.returncode != 0:
+        print(f"gh {' '.join(args)} failed: {result.stderr.strip()}", file=sys.stderr)
+        return None
+    return result.stdout
+
+
+def _ensure_label_exists():
+    _run_gh(["label", "create", FAILURE_LABEL, "--color", "d73a4a", "--force",
+             "--description", "Filed automatically by the app test workflow"])
+
+
+def _list_open_issues():
+    """One bulk query mapping app name -> open failure-issue number."""
+    out = _run_gh(["issue", "list", "--label", FAILURE_LABEL, "--state", "open",
+                   "--json", "number,title", "--limit", "1000"])
+    if not out:
+        return {}
+    issues = {}
+    for issue in json.loads(out):
+        title = issue.get("title", "")
+        if title.startswith(TITLE_PREFIX):
+            issues[title[len(TITLE_PREFIX):]] = issue["number"]
+    return issues
+
+
+def _open_issue(name, error):
+    body = f"Automated testing can no longer fetch **{name}**.\n\n```\n{error}\n```"
+    _run_gh(["issue", "create", "--label", FAILURE_LABEL,
+             "--title", f"{TITLE_PREFIX}{name}", "--body", body])
+    print(f"Opened issue for {name}")
+
+
+def _close_issue(number, name):
+    _run_gh(["issue", "close", str(number),
+             "--comment", f"{name} is passing again; closing automatically."])
+    print(f"Closed issue #{number} for {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=StyledHelpFormatter)
+    parser.add_argument("results", help="JSON results file produced by test-apps.py")
+    args = parser.parse_args()
+
+    with open(args.results, encoding="utf-8") as f:
+        results = json.load(f)
+
+    _ensure_label_exists()
+    open_issues_by_app = _list_open_issues()
+
+    for result in results:
+        name = result.get("name") or result.get("id", "unknown")
+        issue = open_issues_by_app.get(name)
+        if result.get("ok"):
+            if issue is not None:
+                _close_issue(issue, name)
+        elif issue is None:
+            _open_issue(name, result.get("error", "unknown error"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""Interactive release publisher: tags, builds notes and uploads the pack."""
+
+import functools
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # streaming is optional; fall back to a full load
+    ijson = None
+
+# One parse entry point for the hot paths; orjson's decoder is several
+# times faster than stdlib json on the multi-hundred-KB pack files.
+_loads = json.loads if orjson is None else orjson.loads
+
+from help_formatter import GREEN, RESET, YELLOW
+from utils import (
+    APPLICATIONS_JSON,
+    REPO_ROOT,
+    include_flags,
+    make_obtainium_link,
+)
+
+# re.ASCII keeps \d to [0-9] and skips the Unicode property tables.
+SEMVER_PATTERN = re.compile(r"^v?(\d+)\.(\d+)\.(\d+)$", re.ASCII)
+_semver_match = SEMVER_PATTERN.match
+
+GITHUB_NOREPLY_SUFFIX = "@users.noreply.github.com"
+_SUFFIX_LEN = len(GITHUB_NOREPLY_SUFFIX)
+
+STANDARD_JSON = REPO_ROOT / "obtainium-emulation-pack.json"
+DUAL_SCREEN_JSON = REPO_ROOT / "obtainium-emulation-pack-dual-screen.json"
+
+_CHECKMARK = ("❌", "✅")
+
+
+def run(cmd, check=True, capture=False):
+    """Run *cmd* from the repo root; returns the CompletedProcess."""
+    return subprocess.run(
+        cmd, cwd=REPO_ROOT, check=check, text=True, capture_output=capture
+    )
+
+
+def _git_log_combined(since_tag):
+    """One `git log` pass yielding (subject, author_name, author_email).
+
+    Subjects and author identity come out of the same revwalk, with fields
+    split on an ASCII unit separator, so one fork/exec serves both the
+    summary and contributor lists. Output is streamed line by line off the
+    pipe rather than buffered whole, keeping memory flat however many
+    commits the release spans.
+    """
+    span = f"{since_tag}..HEAD" if since_tag else "HEAD"
+    # Merge and release-chore commits are dropped inside git's revwalk
+    # (--no-merges at reachability level, --invert-grep for the subject
+    # filter) instead of being shipped over the pipe and skipped here.
+    with subprocess.Popen(
+        ["git", "log", span, "--no-merges", "--invert-grep", "--grep=^release:",
+         "--pretty=format:%s%x1f%an%x1f%ae"],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True,
+    ) as proc:
+        for line in proc.stdout:
+            subject, _, rest = line.rstrip("\n").partition("\x1f")
+            name, _, email = rest.partition("\x1f")
+            yield subject, name, email
+
+
+def extract_github_username(name, email):
+    """Best-effort GitHub username from a commit author identity."""
+    if email.endswith(GITHUB_NOREPLY_SUFFIX):
+        # One partition covers both the "12345+user" and bare-user forms.
+        local, sep, user = email[:-_SUFFIX_LEN].partition("+")
+        return user if sep else local
+    return name
+
+
+def parse_semver(tag):
+    """Return (major, minor, patch) ints, or None if *tag* is not semver."""
+    match = _semver_match(tag)
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.groups())
+
+
+@functools.lru_cache(maxsize=1)
+def list_tags():
+    """Local release-shaped tag names, version-sorted descending, one ref pass.
+
+    Cached so the latest-tag scan and the duplicate-tag check share a
+    single for-each-ref spawn. The globs pre-filter CI/build/alias tags on
+    the git side; they are looser than SEMVER_PATTERN, so matches are
+    still validated in Python.
+    """
+    result = run(
+        ["git", "for-each-ref", "--sort=-v:refname",
+         "--format=%(refname:short)",
+         "refs/tags/v[0-9]*", "refs/tags/[0-9]*"],
+        check=False, capture=True,
+    )
+    if result.returncode != 0:
+        return ()
+    return tuple(result.stdout.splitlines())
+
+
+def get_latest_tag():
+    """Most recent semver tag in the local repo, or None."""
+    return next((tag for tag in list_tags() if _semver_match(tag)), None)
+
+
+def tag_exists(version):
+    """Whether *version* already exists locally, from the cached ref pass."""
+    return version in list_tags()
+
+
+def get_latest_remote_tag():
+    """Latest semver tag on origin via `git ls-remote` — ref names only.
+
+    Unlike `git fetch --tags` this transfers no objects, just the ref list
+    over one connection, so it stays sub-second however many releases exist.
+    Returns None when offline or no semver tag is published.
+    """
+    result = run(
+        ["git", "ls-remote", "--tags", "--refs", "origin"], check=False, capture=True
+    )
+    if result.returncode != 0:
+        return None
+    best = None
+    best_key = None
+    for line in result.stdout.splitlines():
+        _, _, ref = line.partition("\t")
+        tag = ref.removeprefix("refs/tags/")
+        parsed = parse_semver(tag)
+        if parsed is not None and (best_key is None or parsed > best_key):
+            best, best_key = tag, parsed
+    return best
+
+
+def prompt_version(latest):
+    """Ask for the version to publish, suggesting the next patch release."""
+    if latest and (parsed := parse_semver(latest)):
+        major, minor, patch = parsed
+        suggestion = f"v{major}.{minor}.{patch + 1}"
+    else:
+        suggestion = "v1.0.0"
+    while True:
+        raw = input(f"Version to release [{suggestion}]: ").strip() or suggestion
+        if _semver_match(raw):
+            return raw if raw.startswith("v") else f"v{raw}"
+        print(f"{YELLOW}Not a semver version (vMAJOR.MINOR.PATCH).{RESET}")
+
+
+class _CatFile:
+    """A persistent `git cat-file --batch` session.
+
+    Every fetch is a write+read on an already-open pipe instead of a fresh
+    git startup, which is what makes multi-ref inspection cheap. Usable as
+    a context manager for an explicitly scoped session; the module-level
+    helpers share one lazily started instance.
+    """
+
+    def __init__(self):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=REPO_ROOT,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def fetch(self, ref, path):
+        """Blob bytes for `<ref>:<path>`, or None when the object is missing."""
+        proc = self._proc
+        proc.stdin.write(f"{ref}:{path}\n".encode())
+        proc.stdin.flush()
+        header = proc.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            return None
+        size = int(header[2])
+        # The object is followed by a terminating newline; consume both.
+        return proc.stdout.read(size + 1)[:size]
+
+    def close(self):
+        self._proc.stdin.close()
+        self._proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_batch_session = None
+
+
+def _git_batch(request):
+    """Resolve one `<ref>:<path>`-style request via the shared session."""
+    global _batch_session
+    if _batch_session is None or _batch_session._proc.poll() is not None:
+        _batch_session = _CatFile()
+    ref, _, path = request.partition(":")
+    return _batch_session.fetch(ref, path)
+
+
+@functools.lru_cache(maxsize=8)
+def load_apps_from_ref(ref):
+    """Apps dict {id: app} as of *ref*, via the shared cat-file session.
+
+    Cached per ref (a tag's content never changes) and wrapped read-only so
+    callers can't mutate an entry a later caller would then see.
+    """
+    raw = _git_batch(f"{ref}:src/applications.json")
+    if raw is None:
+        return MappingProxyType({})
+    data = _loads(raw)
+    return MappingProxyType({app["id"]: app for app in data.get("apps", [])})
+
+
+@functools.lru_cache(maxsize=2)
+def _load_apps_file_cached(mtime_ns):
+    with open(APPLICATIONS_JSON, "rb") as f:
+        data = _loads(f.read())
+    return MappingProxyType({app["id"]: app for app in data.get("apps", [])})
+
+
+def load_apps_from_file():
+    """Apps dict {id: app} from the working-tree applications.json.
+
+    Keyed on the file's mtime so repeated calls (diff preview, regenerated
+    notes) reuse one parse while edits still invalidate.
+    """
+    return _load_apps_file_cached(APPLICATIONS_JSON.stat().st_mtime_ns)
+
+
+def normalize_app_for_comparison(app):
+    """Strip presentation-only fields so the diff reflects real changes."""
+    normalized = {k: v for k, v in app.items() if k != "meta"}
+    settings = normalized.get("additionalSettings")
+    if isinstance(settings, str):
+        normalized["additionalSettings"] = _loads(settings)
+    return normalized
+
+
+def _digest(value):
+    if orjson is not None:
+        canonical = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _raw_fingerprint(app):
+    """Digest of the app as stored (minus meta) — no settings re-parse."""
+    return _digest({k: v for k, v in app.items() if k != "meta"})
+
+
+def diff_apps(old_apps, new_apps):
+    """Return (added, changed, removed) app lists between two {id: app} maps."""
+    # dict views are already set-like; no intermediate set() materialization.
+    old_ids = old_apps.keys()
+    new_ids = new_apps.keys()
+    added = [new_apps[i] for i in sorted(new_ids - old_ids)]
+    removed = [old_apps[i] for i in sorted(old_ids - new_ids)]
+    # Two-tier change test: the raw fingerprint skips the additionalSettings
+    # re-parse entirely — equal raw bytes imply equal canonical form, which
+    # is the common case. Raw mismatches are confirmed structurally: dict
+    # equality short-circuits at the first differing value and never
+    # serializes either side.
+    changed = []
+    for app_id in sorted(old_ids & new_ids):
+        old_app = old_apps[app_id]
+        new_app = new_apps[app_id]
+        if _raw_fingerprint(old_app) == _raw_fingerprint(new_app):
+            continue
+        if normalize_app_for_comparison(old_app) != normalize_app_for_comparison(new_app):
+            changed.append(new_app)
+    return added, changed, removed
+
+
+def applications_changed(since):
+    """Whether applications.json differs from its state at *since*.
+
+    A bare exit-code probe — git answers from blob identity without either
+    side being parsed. Compares against the working tree so uncommitted
+    app edits still count.
+    """
+    result = run(
+        ["git", "diff", "--quiet", since, "--", "src/applications.json"],
+        check=False,
+    )
+    return result.returncode != 0
+
+
+def _stream_fingerprints(source):
+    """Map each app id to its raw fingerprint from a binary file-like.
+
+    With ijson each app subtree is hashed and dropped as soon as it is
+    parsed, so peak memory is one app rather than the whole document; the
+    fallback parses once and iterates.
+    """
+    if ijson is not None:
+        return {app["id"]: _raw_fingerprint(app) for app in ijson.items(source, "apps.item")}
+    return {app["id"]: _raw_fingerprint(app) for app in _loads(source.read()).get("apps", [])}
+
+
+def get_display_name(app):
+    meta = app.get("meta") or {}
+    return meta.get("displayName") or app.get("name") or app.get("id", "")
+
+
+def get_application_url(app):
+    return app.get("url", "")
+
+
+def _row_fields(app):
+    """All per-app row inputs in one pass: (sort_key, name, url, link, std, ds)."""
+    name = get_display_name(app)
+    # include_flags resolves both variant columns from one meta lookup;
+    # two should_include_app calls would walk the meta dict four times.
+    exported = not (app.get("meta") or {}).get("excludeFromExport")
+    std, ds = include_flags(app)
+    return (
+        name.lower(),
+        name,
+        get_application_url(app),
+        make_obtainium_link(app),
+        exported and std,
+        exported and ds,
+    )
+
+
+# Prebuilt row template, same convention as help_formatter's colour wraps:
+# one C-level % format per row instead of stitching f-string pieces.
+_ROW_TEMPLATE = (
+    '| <a href="%s">%s</a> | <a href="%s">Add to Obtainium!</a> | %s | %s |\n'
+)
+
+
+def make_app_table_row(fields):
+    _, name, url, link, std, ds = fields
+    return _ROW_TEMPLATE % (url, name, link, _CHECKMARK[std], _CHECKMARK[ds])
+
+
+_TABLE_HEADER = (
+    "| App | Add | Standard | Dual-Screen |\n"
+    "| --- | --- | :---: | :---: |\n"
+)
+
+
+def generate_app_table(apps, group_by_category=False, out=None):
+    """Markdown table(s) for *apps*; optionally one table per category.
+
+    Each app's display name, url, link and variant flags are computed once
+    up front; sorting uses the cached lowercase key instead of calling back
+    into get_display_name per comparison. With *out* the rows are written
+    straight into the caller's buffer and nothing is returned; otherwise
+    the rendered table comes back as a string.
+    """
+    buf = io.StringIO() if out is None else out
+    write = buf.write
+    if not group_by_category:
+        rows = [_row_fields(app) for app in apps]
+        rows.sort(key=itemgetter(0))
+        write(_TABLE_HEADER)
+        for fields in rows:
+            write(make_app_table_row(fields))
+        return buf.getvalue().rstrip("\n") if out is None else None
+
+    # Sort once globally, then bucket: appends preserve order, so every
+    # category list comes out sorted without K per-bucket sort calls.
+    decorated = [(_row_fields(app), app.get("categories", ["Uncategorized"])) for app in apps]
+    decorated.sort(key=lambda entry: entry[0][0])
+    categorized = {}
+    for fields, categories in decorated:
+        for category in categories:
+            categorized.setdefault(category, []).append(fields)
+    for i, category in enumerate(sorted(categorized)):
+        if i:
+            write("\n")
+        write(f"#### {category}\n\n")
+        write(_TABLE_HEADER)
+        for fields in categorized[category]:
+            write(make_app_table_row(fields))
+    return buf.getvalue().rstrip("\n") if out is None else None
+
+
+def get_app_count(path):
+    """Number of apps in a built pack file.
+
+    Counts `"id":` occurrences over an mmap — a single linear scan at
+    memchr speed with no parse at all. Exact for the minified packs: every
+    app has one top-level id, and ids nested inside additionalSettings are
+    stored escaped (\\"id\\":) so they never match. Falls back to a real
+    parse if the file doesn't look like a pack.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'"apps":') >= 0:
+                count = 0
+                pos = mm.find(b'"id":')
+                while pos >= 0:
+                    count += 1
+                    pos = mm.find(b'"id":', pos + 5)
+                return count
+        f.seek(0)
+        return len(_loads(f.read()).get("apps", []))
+
+
+def _find_artifacts():
+    """One directory scan returning {name: DirEntry} for the built packs."""
+    wanted = {STANDARD_JSON.name, DUAL_SCREEN_JSON.name}
+    found = {}
+    with os.scandir(REPO_ROOT) as entries:
+        for entry in entries:
+            if entry.name in wanted:
+                found[entry.name] = entry
+    return found
+
+
+def generate_release_notes(version, latest_tag):
+    """Assemble the markdown body for the GitHub release."""
+    # One constant-memory pass over the streamed log feeds both sections.
+    summaries = []
+    contributors = {}
+    for subject, name, email in _git_log_combined(latest_tag):
+        summaries.append(f"- {subject}")
+        if email not in contributors:
+            contributors[email] = name
+
+    # Tiered diff: a byte-identical file short-circuits on git's exit code
+    # alone; a changed file is fingerprinted at streaming granularity, and
+    # only a genuine content change materializes both full app sets.
+    if latest_tag and not applications_changed(latest_tag):
+        added = changed = removed = ()
+    else:
+        old_raw = _git_batch(f"{latest_tag}:src/applications.json") if latest_tag else None
+        old_fps = _stream_fingerprints(io.BytesIO(old_raw)) if old_raw is not None else {}
+        with open(APPLICATIONS_JSON, "rb") as f:
+            new_fps = _stream_fingerprints(f)
+        if latest_tag and old_fps == new_fps:
+            added = changed = removed = ()
+        else:
+            old_apps = load_apps_from_ref(latest_tag) if latest_tag else {}
+            new_apps = load_apps_from_file()
+            added, changed, removed = diff_apps(old_apps, new_apps)
+
+    buf = io.StringIO()
+    write = buf.write
+    write(f"## {version}\n")
+    if added:
+        write("\n### New Apps\n\n")
+        generate_app_table(added, out=buf)
+    if changed:
+        write("\n### Updated Apps\n\n")
+        generate_app_table(changed, out=buf)
+    if removed:
+        write("\n### Removed Apps\n\n")
+        removed_names = sorted(
+            ((name.lower(), name) for name in map(get_display_name, removed)),
+        )
+        for _, name in removed_names:
+            write(f"- {name}\n")
+
+    if summaries:
+        write("\n### Commits\n\n")
+        for summary in summaries:
+            write(f"{summary}\n")
+
+    if contributors:
+        write("\n### Contributors\n\n")
+        mentions = []
+        for email, name in contributors.items():
+            username = extract_github_username(name, email)
+            mentions.append(f"@{username}" if email.endswith(GITHUB_NOREPLY_SUFFIX) else username)
+        write(", ".join(mentions))
+        write("\n")
+    return buf.getvalue()
+
+
+def edit_release_notes(notes):
+    """Open *notes* in $EDITOR and return the edited text.
+
+    Written through the raw mkstemp fd and read back with Path.read_text:
+    no buffered file objects, and the handle is closed before the editor
+    opens the file.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix="-release-notes.md", prefix="obtainium-")
+    try:
+        os.write(fd, notes.encode("utf-8"))
+        os.close(fd)
+        editor = os.environ.get("EDITOR", "vi")
+        subprocess.run([editor, tmp_path], check=True)
+        return Path(tmp_path).read_text(encoding="utf-8").strip() + "\n"
+    finally:
+        os.unlink(tmp_path)
+
+
+def _fast_copy(src, dst):
+    """Hardlink *dst* to *src* when possible; O(1) metadata, no bytes moved.
+
+    The versioned names only exist for gh to read during upload, so sharing
+    the inode is safe. Falls back to a real copy across filesystems or on
+    platforms without link support.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def create_versioned_copies(version):
+    """Expose the built packs under versioned filenames for the release assets."""
+    standard_versioned = REPO_ROOT / f"obtainium-emulation-pack-{version}.json"
+    dual_versioned = REPO_ROOT / f"obtainium-emulation-pack-dual-screen-{version}.json"
+    _fast_copy(STANDARD_JSON, standard_versioned)
+    _fast_copy(DUAL_SCREEN_JSON, dual_versioned)
+    return [standard_versioned, dual_versioned]
+
+
+def cleanup(paths):
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def commit_release_artifacts(version):
+    """Stage, commit and push in one shell exec instead of three git spawns.
+
+    *version* is already semver-validated, but quote it anyway.
+    """
+    message = shlex.quote(f"release: {version}")
+    subprocess.run(
+        f"git add -A && git commit -m {message} && git push",
+        shell=True, cwd=REPO_ROOT, check=True,
+    )
+
+
+def create_tag_local(version):
+    run(["git", "tag", version])
+
+
+def push_tag(version):
+    run(["git", "push", "origin", version])
+
+
+def create_github_release(version, notes, assets):
+    """Create the release, then upload the assets concurrently.
+
+    gh uploads positional assets one after another; creating the release
+    empty and running one `gh release upload` per asset in threads overlaps
+    the network round trips instead.
+    """
+    run(["gh", "release", "create", version, "--title", version, "--notes", notes])
+    with ThreadPoolExecutor(max_workers=len(assets)) as ex:
+        list(ex.map(
+            lambda asset: run(["gh", "release", "upload", version, str(asset)]),
+            assets,
+        ))
+
+
+def _gh_auth_status():
+    """None when gh is missing, else whether it is authenticated."""
+    if shutil.which("gh") is None:
+        return None
+    return run(["gh", "auth", "status"], check=False, capture=True).returncode == 0
+
+
+def check_prerequisites(auth_ok):
+    """gh must be installed and authenticated before we touch the remote."""
+    if auth_ok is None:
+        sys.exit("gh CLI not found; install it from https://cli.github.com/")
+    if not auth_ok:
+        sys.exit("gh is not authenticated; run `gh auth login` first.")
+
+
+def check_working_tree_clean():
+    result = run(["git", "status", "--porcelain"], check=False, capture=True)
+    return not result.stdout.strip()
+
+
+def main():
+    # The startup checks are independent read-only subprocesses; overlap
+    # them so the wall time is the slowest call, not the sum.
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_auth = ex.submit(_gh_auth_status)
+        f_remote = ex.submit(get_latest_remote_tag)
+        f_tags = ex.submit(list_tags)
+        f_clean = ex.submit(check_working_tree_clean)
+        check_prerequisites(f_auth.result())
+        f_tags.result()
+        # Ref names are all we need to suggest the next version, but the
+        # release notes diff against *latest* with local git commands — so
+        # only trust the remote tag if it also exists here, and fall back
+        # to the newest local tag otherwise (offline, or unfetched tags).
+        remote_latest = f_remote.result()
+        if remote_latest and tag_exists(remote_latest):
+            latest = remote_latest
+        else:
+            latest = get_latest_tag()
+        tree_clean = f_clean.result()
+    print(f"Latest release: {latest or '(none)'}")
+    version = prompt_version(latest)
+
+    if tag_exists(version):
+        sys.exit(f"Tag {version} already exists.")
+
+    artifacts = _find_artifacts()
+    for artifact in (STANDARD_JSON, DUAL_SCREEN_JSON):
+        if artifact.name not in artifacts:
+            sys.exit(f"Missing build artifact {artifact.name}; run minify-json.py first.")
+    print(f"Standard pack: {get_app_count(STANDARD_JSON)} apps")
+    print(f"Dual-screen pack: {get_app_count(DUAL_SCREEN_JSON)} apps")
+
+    notes = generate_release_notes(version, latest)
+    notes = edit_release_notes(notes)
+
+    if not tree_clean:
+        commit_release_artifacts(version)
+
+    # The local asset links and the local tag are independent; overlap them,
+    # then push before the release so the tag exists on the remote.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_copies = ex.submit(create_versioned_copies, version)
+        f_tag = ex.submit(create_tag_local, version)
+        copies = f_copies.result()
+        f_tag.result()
+    try:
+        push_tag(version)
+        create_github_release(version, notes, copies)
+    finally:
+        cleanup(copies)
+    print(f"{GREEN}Released {version}.{RESET}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""Check that every app's source still serves a downloadable APK."""
+
+import argparse
+import copy
+import functools
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import sys
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from itertools import islice
+from urllib.error import URLError
+from urllib.parse import urljoin, urlparse
+
+from constants import SETTINGS_SCHEMA, compile_setting_regex, source_for_url
+from help_formatter import DIM, GREEN, RESET, YELLOW
+from utils import get_additional_settings, load_apps, load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = json.loads if orjson is None else orjson.loads
+
+# A tuple lets str.endswith check every extension in one C call.
+APK_EXTENSIONS = (".apk", ".xapk")
+MAX_STORED_APK_URLS = 8
+USER_AGENT = "obtainium-emulation-pack-tester"
+REQUEST_TIMEOUT = 30
+
+# Network testing is I/O-bound: the pool overlaps the per-app fetches while
+# the per-host semaphores keep any single API (GitHub especially) from
+# seeing a burst that trips secondary rate limits.
+_MAX_WORKERS = 16
+_PER_HOST_LIMIT = 5
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+# Default values for the additionalSettings keys the testers consult.
+_SETTING_DEFAULTS = {
+    "includePrereleases": False,
+    "fallbackToOlderReleases": True,
+    "filterReleaseTitlesByRegEx": "",
+    "filterReleaseNotesByRegEx": "",
+    "verifyLatestTag": False,
+    "trackOnly": False,
+    "versionExtractionRegEx": "",
+    "matchGroupToUse": "",
+    "apkFilterRegEx": "",
+    "invertAPKFilter": False,
+    "includeZips": False,
+    "customLinkFilterRegex": "",
+    "requestHeader": [],
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_url(url):
+    """urlparse, memoized — app URLs are re-parsed on every request/redirect."""
+    return urlparse(url)
+
+
+def _host_slot(host):
+    """Per-host semaphore capping concurrent requests to one endpoint."""
+    with _host_semaphores_lock:
+        sem = _host_semaphores.get(host)
+        if sem is None:
+            sem = _host_semaphores[host] = threading.Semaphore(_PER_HOST_LIMIT)
+    return sem
+
+
+# Built once at import; context creation reads the CA bundle and allocates
+# OpenSSL state, far too heavy to repeat per request. Verification posture
+# is unchanged from before (disabled — we only probe availability).
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+# Per-thread, per-host keep-alive connections: the dominant cost of the
+# api.github.com calls is the TLS handshake, paid once per pooled
+# connection instead of once per request.
+_conn_local = threading.local()
+
+
+def _get_connection(scheme, host):
+    pool = getattr(_conn_local, "pool", None)
+    if pool is None:
+        pool = _conn_local.pool = {}
+    conn = pool.get(host)
+    if conn is None:
+        if scheme == "http":
+            conn = http.client.HTTPConnection(
+                host, timeout=REQUEST_TIMEOUT, blocksize=65536)
+        else:
+            conn = http.client.HTTPSConnection(
+                host, timeout=REQUEST_TIMEOUT, context=_SSL_CTX, blocksize=65536)
+        pool[host] = conn
+    return conn
+
+
+def _drop_connection(host):
+    conn = _conn_local.pool.pop(host, None)
+    if conn is not None:
+        conn.close()
+
+
+def _make_request(url, headers=None, _redirects=5, with_meta=False, method="GET", data=None):
+    """Issue *method* on *url* over a pooled keep-alive connection.
+
+    Returns the body bytes; with *with_meta* the caller gets
+    ``(body, status, etag)`` instead and 3xx/304 responses are passed
+    through for conditional-request handling.
+    """
+    parsed = _parse_url(url)
+    host = parsed.netloc
+    path = parsed.path or "/"
+    if parsed.query:
+        path = f"{path}?{parsed.query}"
+    request_headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive"}
+    if headers:
+        request_headers.update(headers)
+    with _host_slot(host):
+        try:
+            conn = _get_connection(parsed.scheme, host)
+            conn.request(method, path, body=data, headers=request_headers)
+            resp = conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            # Stale keep-alive (server closed it); retry once on a fresh
+            # connection before giving up.
+            _drop_connection(host)
+            conn = _get_connection(parsed.scheme, host)
+            conn.request(method, path, body=data, headers=request_headers)
+            resp = conn.getresponse()
+        body = resp.read()
+        status = resp.status
+        location = resp.getheader("Location")
+        etag = resp.getheader("ETag")
+    if 300 <= status < 400 and location:
+        if not _redirects:
+            raise URLError(f"too many redirects for {url}")
+        return _make_request(urljoin(url, location), headers, _redirects - 1, with_meta)
+    if status >= 400:
+        raise URLError(f"HTTP {status} for {url}")
+    if with_meta:
+        return body, status, etag
+    return body
+
+
+def _fetch_json(url, headers=None):
+    # orjson parses the raw bytes directly; no intermediate str of the
+    # (often multi-hundred-KB) releases payload is ever built.
+    return _loads(_make_request(url, headers))
+
+
+_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "obtainium-emulation-pack"
+)
+
+
+def _fetch_json_cached(url, headers=None):
+    """Conditional GET backed by an on-disk ETag cache.
+
+    GitHub serves an ETag with every releases response and a 304 against
+    If-None-Match costs no rate-limit quota and no response body; repeat
+    runs where nothing was released reuse the cached payload from disk.
+    """
+    key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    body_path = _CACHE_DIR / f"{key}.json"
+    etag_path = _CACHE_DIR / f"{key}.etag"
+    request_headers = dict(headers) if headers else {}
+    cached = None
+    try:
+        cached = body_path.read_bytes()
+        request_headers["If-None-Match"] = etag_path.read_text(encoding="ascii")
+    except OSError:
+        cached = None
+    body, status, etag = _make_request(url, request_headers, with_meta=True)
+    if status == 304 and cached is not None:
+        return _loads(cached)
+    if etag:
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            body_path.write_bytes(body)
+            etag_path.write_text(etag, encoding="ascii")
+        except OSError:
+            pass  # caching is best-effort; a read-only home just disables it
+    return _loads(body)
+
+
+def _github_headers():
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def _parse_owner_repo(url):
+    """Split a forge URL into (owner, repo).
+
+    These are well-formed https://host/owner/repo strings, so a couple of
+    str splits beat urlparse's scheme normalization and regex machinery.
+    """
+    sep = url.find("://")
+    rest = url[sep + 3:] if sep >= 0 else url
+    path = rest.partition("/")[2].partition("?")[0].partition("#")[0]
+    parts = path.strip("/").split("/", 2)
+    if len(parts) < 2 or not parts[1]:
+        raise ValueError(f"cannot extract owner/repo from {url}")
+    return parts[0], parts[1]
+
+
+def _effective_source(app):
+    """The source type a tester should treat *app* as."""
+    return app.get("overrideSource") or source_for_url(app.get("url", "")) or "HTML"
+
+
+# deepcopy is pure waste for immutable defaults; only the mutable few
+# (requestHeader's list) need a real copy before the caller mutates.
+_IMMUTABLE = (type(None), bool, int, float, str, tuple, frozenset)
+
+
+def _clone(value):
+    return value if isinstance(value, _IMMUTABLE) else copy.deepcopy(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _defaults_template(source):
+    """The schema defaults applying to *source*; shared across calls."""
+    return {
+        key: _SETTING_DEFAULTS.get(key)
+        for key, defn in SETTINGS_SCHEMA.items()
+        if source in defn.sources
+    }
+
+
+def get_defaults_for_source(source):
+    """Default settings values for every schema key that applies to *source*."""
+    return {key: _clone(value) for key, value in _defaults_template(source).items()}
+
+
+def _settings_for(app, source):
+    settings = get_defaults_for_source(source)
+    settings.update(get_additional_settings(app))
+    return settings
+
+
+class LinkExtractor(HTMLParser):
+    """Collect every raw anchor href; resolution happens after parsing."""
+
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value:
+                self.hrefs.append(value)
+
+
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxHTML
+except ImportError:  # the C parser is optional; html.parser always works
+    _SelectolaxHTML = None
+
+
+def _extract_links(html_body, base_url):
+    if _SelectolaxHTML is not None:
+        hrefs = [
+            href
+            for node in _SelectolaxHTML(html_body).css("a[href]")
+            if (href := node.attributes["href"])
+        ]
+    else:
+        parser = LinkExtractor()
+        parser.feed(html_body)
+        hrefs = parser.hrefs
+    # Mirror pages link mostly-absolute URLs; skip urljoin (which
+    # re-parses both sides) for anything already carrying a scheme.
+    return [
+        href if href.startswith(("http://", "https://")) else urljoin(base_url, href)
+        for href in hrefs
+    ]
+
+
+def _filter_links_by_extension(links):
+    return [link for link in links if link.lower().endswith(APK_EXTENSIONS)]
+
+
+def _filter_links_by_regex(links, pattern):
+    search = compile_setting_regex(pattern).search
+    return [link for link in links if search(link)]
+
+
+def _extract_version(text, settings):
+    """Pull a version out of *text* per the app's extraction settings."""
+    pattern = settings.get("versionExtractionRegEx")
+    if not pattern:
+        return text
+    match = compile_setting_regex(pattern).search(text)
+    if match is None:
+        return None
+    group = settings.get("matchGroupToUse")
+    return match.group(int(group)) if group else match.group(0)
+
+
+_APK_OR_ZIP = APK_EXTENSIONS + (".zip",)
+
+
+def _iter_apk_urls(release, settings):
+    """Lazily yield the release's asset urls that pass the app's filters.
+
+    A generator lets islice stop at MAX_STORED_APK_URLS without ever
+    touching the remaining assets of a large release.
+    """
+    exts = _APK_OR_ZIP if settings.get("includeZips") else APK_EXTENSIONS
+    pattern = settings.get("apkFilterRegEx")
+    search = compile_setting_regex(pattern).search if pattern else None
+    invert = settings.get("invertAPKFilter", False)
+    for asset in release.get("assets", []):
+        url = asset.get("browser_download_url")
+        if not url or not asset.get("name", "").lower().endswith(exts):
+            continue
+        if search is not None and bool(search(url)) == invert:
+            continue
+        yield url
+
+
+def _find_release_with_apks(releases, settings, title_regex=None, notes_regex=None):
+    """First release that passes the app's filters and still serves APKs."""
+    include_prereleases = settings.get("includePrereleases", False)
+    fallback = settings.get("fallbackToOlderReleases", True)
+    for release in releases:
+        if release.get("draft"):
+            continue
+        if release.get("prerelease") and not include_prereleases:
+            continue
+        if title_regex is not None and not title_regex.search(release.get("name") or ""):
+            continue
+        if notes_regex is not None and not notes_regex.search(release.get("body") or ""):
+            continue
+        apks = list(islice(_iter_apk_urls(release, settings), MAX_STORED_APK_URLS))
+        if apks:
+            return release, apks
+        if not fallback:
+            break
+    return None, []
+
+
+def _test_releases(app, settings, releases):
+    """Shared GitHub/Codeberg logic over an already-fetched release list."""
+    title_regex = None
+    notes_regex = None
+    if settings.get("filterReleaseTitlesByRegEx"):
+        title_regex = compile_setting_regex(settings["filterReleaseTitlesByRegEx"])
+    if settings.get("filterReleaseNotesByRegEx"):
+        notes_regex = compile_setting_regex(settings["filterReleaseNotesByRegEx"])
+    release, apks = _find_release_with_apks(releases, settings, title_regex, notes_regex)
+    if release is None:
+        if settings.get("trackOnly"):
+            # Track-only apps never download anything; a visible release
+            # (or any tag history at all) is enough.
+            if any(not r.get("draft") for r in releases):
+                return {"ok": True, "version": None, "apk_urls": []}
+        return {"ok": False, "error": "no release with usable APK assets"}
+    version = _extract_version(release.get("tag_name") or release.get("name") or "", settings)
+    if version is None:
+        return {"ok": False, "error": "versionExtractionRegEx matched nothing"}
+    return {"ok": True, "version": version, "apk_urls": apks}
+
+
+def _fetch_github_releases(owner, repo):
+    return _fetch_json_cached(
+        f"https://api.github.com/repos/{owner}/{repo}/releases?per_page=25",
+        _github_headers(),
+    )
+
+
+def test_github(app, settings):
+    owner, repo = _parse_owner_repo(app["url"])
+    return _test_releases(app, settings, _fetch_github_releases(owner, repo))
+
+
+def _test_github_repo_group(key, apps):
+    """Evaluate every app sharing one GitHub repo off a single REST fetch."""
+    try:
+        releases = _fetch_github_releases(*key)
+    except (OSError, http.client.HTTPException) as exc:
+        releases = exc
+    results = []
+    for app in apps:
+        result = {
+            "id": app.get("id"),
+            "name": app.get("name") or app.get("id"),
+            "source": "GitHub",
+        }
+        if isinstance(releases, Exception):
+            result.update(ok=False, error=str(releases))
+        else:
+            result.update(_test_releases(app, _settings_for(app, "GitHub"), releases))
+        results.append(result)
+    return results
+
+
+# GraphQL collapses one REST round-trip per repo into one POST per 40
+# repos, and the query names only the fields the filters below consume.
+_GRAPHQL_URL = "https://api.github.com/graphql"
+_GRAPHQL_BATCH = 40
+
+_GRAPHQL_REPO_FIELDS = (
+    "releases(first: 25, orderBy: {field: CREATED_AT, direction: DESC}) { nodes {"
+    " tagName name description isPrerelease isDraft"
+    " releaseAssets(first: 50) { nodes { name downloadUrl } } } }"
+)
+
+
+def _release_from_graphql(node):
+    """Reshape a GraphQL release node into the REST layout the filters expect."""
+    return {
+        "tag_name": node.get("tagName"),
+        "name": node.get("name"),
+        "body": node.get("description"),
+        "prerelease": node.get("isPrerelease", False),
+        "draft": node.get("isDraft", False),
+        "assets": [
+            {"name": asset.get("name"), "browser_download_url": asset.get("downloadUrl")}
+            for asset in (node.get("releaseAssets") or {}).get("nodes") or []
+        ],
+    }
+
+
+def _fetch_releases_graphql(repos):
+    """Fetch releases for several (owner, repo) pairs in one GraphQL POST."""
+    parts = [
+        'repo%d: repository(owner: "%s", name: "%s") { %s }'
+        % (i, owner, repo, _GRAPHQL_REPO_FIELDS)
+        for i, (owner, repo) in enumerate(repos)
+    ]
+    payload = json.dumps({"query": "query { %s }" % " ".join(parts)}).encode("utf-8")
+    headers = _github_headers()
+    headers["Content-Type"] = "application/json"
+    response = _loads(_make_request(_GRAPHQL_URL, headers, method="POST", data=payload))
+    repo_data = response.get("data") or {}
+    if not repo_data and response.get("errors"):
+        raise URLError(f"GraphQL: {response['errors'][0].get('message', 'query failed')}")
+    fetched = {}
+    for i, key in enumerate(repos):
+        node = repo_data.get(f"repo{i}")
+        if node is None:  # missing/renamed repo comes back as a null alias
+            fetched[key] = None
+        else:
+            nodes = (node.get("releases") or {}).get("nodes") or []
+            fetched[key] = [_release_from_graphql(n) for n in nodes]
+    return fetched
+
+
+def _test_github_batch(apps):
+    """Test GitHub apps together, one GraphQL round-trip per repo batch."""
+    results = []
+    entries = []
+    for app in apps:
+        result = {
+            "id": app.get("id"),
+            "name": app.get("name") or app.get("id"),
+            "source": "GitHub",
+        }
+        try:
+            entries.append((app, result, _parse_owner_repo(app["url"])))
+        except ValueError as exc:
+            result.update(ok=False, error=str(exc))
+            results.append(result)
+    repos = list(dict.fromkeys(key for _, _, key in entries))
+    releases_by_repo = {}
+    for start in range(0, len(repos), _GRAPHQL_BATCH):
+        chunk = repos[start:start + _GRAPHQL_BATCH]
+        try:
+            releases_by_repo.update(_fetch_releases_graphql(chunk))
+        except (OSError, http.client.HTTPException) as exc:
+            releases_by_repo.update((key, exc) for key in chunk)
+    for app, result, key in entries:
+        fetched = releases_by_repo.get(key)
+        if isinstance(fetched, Exception):
+            result.update(ok=False, error=str(fetched))
+        elif fetched is None:
+            result.update(ok=False, error=f"repository {key[0]}/{key[1]} not found")
+        else:
+            result.update(_test_releases(app, _settings_for(app, "GitHub"), fetched))
+        results.append(result)
+    return results
+
+
+def test_codeberg(app, settings):
+    owner, repo = _parse_owner_repo(app["url"])
+    releases = _fetch_json(
+        f"https://codeberg.org/api/v1/repos/{owner}/{repo}/releases?limit=25"
+    )
+    return _test_releases(app, settings, releases)
+
+
+def test_html(app, settings):
+    headers = {}
+    for header in settings.get("requestHeader") or []:
+        name, _, value = header.partition(":")
+        if value:
+            headers[name.strip()] = value.strip()
+    body = _make_request(app["url"], headers).decode("utf-8", errors="replace")
+    links = _extract_links(body, app["url"])
+    pattern = settings.get("customLinkFilterRegex")
+    if pattern:
+        links = _filter_links_by_regex(links, pattern)
+    else:
+        links = _filter_links_by_extension(links)
+    if not links:
+        return {"ok": False, "error": "no APK links found on page"}
+    return {"ok": True, "version": None, "apk_urls": links[:MAX_STORED_APK_URLS]}
+
+
+_TESTERS = {
+    "GitHub": test_github,
+    "Codeberg": test_codeberg,
+    "HTML": test_html,
+}
+
+
+def test_app(app):
+    """Probe one app's source; returns a result dict for reporting."""
+    result = {"id": app.get("id"), "name": app.get("name") or app.get("id")}
+    source = _effective_source(app)
+    result["source"] = source
+    tester = _TESTERS.get(source)
+    if tester is None:
+        result.update(ok=True, skipped=True)
+        return result
+    settings = _settings_for(app, source)
+    try:
+        result.update(tester(app, settings))
+    except (OSError, http.client.HTTPException, ValueError) as exc:
+        # OSError covers URLError/TimeoutError plus the bare socket errors
+        # (gaierror, ConnectionResetError, ssl.SSLError) http.client raises.
+        result.update(ok=False, error=str(exc))
+    return result
+
+
+def print_result(result):
+    # One write per result: on a line-buffered tty every print() is its
+    # own syscall, and results stream in from many worker threads.
+    if result.get("skipped"):
+        out = f"{DIM}SKIP{RESET} {result['name']} ({result['source']})\n"
+    elif result["ok"]:
+        out = f"{GREEN}PASS{RESET} {result['name']}\n"
+        if result.get("version"):
+            out += f"     version: {result['version']}\n"
+        if result.get("apk_urls"):
+            out += f"     apk: {result['apk_urls'][0]}\n"
+    else:
+        out = (
+            f"{YELLOW}FAIL{RESET} {result['name']}\n"
+            f"     {result.get('error', 'unknown error')}\n"
+        )
+    sys.stdout.write(out)
+
+
+def main():
+    from help_formatter import StyledHelpFormatter
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=StyledHelpFormatter)
+    parser.add_argument("ids", nargs="*", help="only test these app ids")
+    parser.add_argument("--output", help="write results as JSON for process-test-results.py")
+    args = parser.parse_args()
+
+    load_dotenv()
+    apps = load_apps()
+    if args.ids:
+        wanted = set(args.ids)
+        apps = [app for app in apps if app.get("id") in wanted]
+        if not apps:
+            sys.exit(f"No apps matched: {', '.join(sorted(wanted))}")
+
+    # Resolve each app's source once; the dispatch below consults it three
+    # times and _effective_source walks the host trie on every call.
+    sources = [_effective_source(app) for app in apps]
+    github_count = sources.count("GitHub")
+    # GraphQL needs auth; without a token GitHub apps fall back to the
+    # per-app REST path alongside everything else.
+    use_graphql = github_count and bool(os.environ.get("GITHUB_TOKEN"))
+    if github_count and not use_graphql:
+        print(f"{YELLOW}No GITHUB_TOKEN set; GitHub requests are rate-limited.{RESET}")
+
+    direct = apps
+    batched = []
+    rest_groups = {}
+    if github_count:
+        direct = [app for app, src in zip(apps, sources) if src != "GitHub"]
+        github_apps = [app for app, src in zip(apps, sources) if src == "GitHub"]
+        if use_graphql:
+            batched = github_apps
+        else:
+            # Apps sharing a repo (variant configs of one upstream) ride on
+            # a single REST fetch instead of hitting the API once each.
+            for app in github_apps:
+                try:
+                    key = _parse_owner_repo(app["url"])
+                except ValueError:
+                    direct.append(app)  # test_app reports the bad URL
+                    continue
+                rest_groups.setdefault(key, []).append(app)
+
+    results = []
+    # I/O-bound fan-out: results print as they complete, like the old
+    # serial loop, but total wall time is bounded by the slowest host.
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        futures = [ex.submit(test_app, app) for app in direct]
+        futures += [
+            ex.submit(_test_github_repo_group, key, group)
+            for key, group in rest_groups.items()
+        ]
+        if batched:
+            futures.append(ex.submit(_test_github_batch, batched))
+        for future in as_completed(futures):
+            outcome = future.result()
+            for result in outcome if isinstance(outcome, list) else (outcome,):
+                results.append(result)
+                print_result(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failures = sum(1 for r in results if not r["ok"])
+    print(f"\n{len(results) - failures}/{len(results)} apps passing")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
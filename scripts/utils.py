@@ -0,0 +1,160 @@
+"""Shared helpers for the repo scripts."""
+
+import functools
+import json
+import mmap
+import os
+import re
+import string
+from pathlib import Path
+
+from constants import OBTAINIUM_SCHEME, REDIRECT_URL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:  # stdlib fallback emitting the same compact UTF-8 bytes
+    def _dumps(payload):
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+_loads = json.loads if orjson is None else orjson.loads
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APPLICATIONS_JSON = REPO_ROOT / "src" / "applications.json"
+
+# Shared read-only fallback: `app.get("meta") or _EMPTY` skips building a
+# fresh empty dict per call, and a missing meta never gets mutated anyway.
+_EMPTY = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _load(path, mtime_ns):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return orjson.loads(memoryview(m)) if orjson is not None else json.loads(m[:])
+
+
+def load_apps(path=None):
+    """Parse applications.json once per (path, mtime) and return its app list."""
+    path = str(path or APPLICATIONS_JSON)
+    return _load(path, os.stat(path).st_mtime_ns)["apps"]
+
+_PREFIX = f"{REDIRECT_URL}?r={OBTAINIUM_SCHEME}"
+
+_QUOTE_SAFE = frozenset((string.ascii_letters + string.digits + "_.-~").encode("ascii"))
+_QUOTE_TABLE = [
+    bytes([b]) if b in _QUOTE_SAFE else f"%{b:02X}".encode("ascii") for b in range(256)
+]
+
+
+def fast_quote_bytes(data):
+    """Percent-encode *data* (safe="") via a precomputed per-byte table."""
+    return b"".join(map(_QUOTE_TABLE.__getitem__, data)).decode("ascii")
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode(app_id, payload_items):
+    """Encode one app payload to a redirect URL; cached per app id + payload."""
+    payload = dict(payload_items)
+    return _PREFIX + fast_quote_bytes(_dumps(payload))
+
+
+def get_additional_settings(app):
+    """Parse the app's additionalSettings JSON string into a dict."""
+    raw = app.get("additionalSettings")
+    if not raw:
+        return {}
+    return _loads(raw)
+
+
+def stringify_additional_settings(settings):
+    """Serialize additionalSettings back to the compact on-disk string form."""
+    return _dumps(settings).decode("utf-8")
+
+
+def should_include_app(app, variant="standard"):
+    """Whether the app belongs in the exported pack for *variant*.
+
+    One meta fetch covers both checks; variant names match the device
+    labels, so no branching on the variant is needed either.
+    """
+    meta = app.get("meta") or _EMPTY
+    if meta.get("excludeFromExport"):
+        return False
+    devices = meta.get("devices")
+    return devices is None or variant in devices
+
+
+def include_flags(app):
+    """Return the (standard, dual-screen) device-column flags in one meta pass."""
+    devices = (app.get("meta") or _EMPTY).get("devices")
+    if devices is None:
+        return (True, True)
+    return ("standard" in devices, "dual-screen" in devices)
+
+
+_PAYLOAD_FIELDS = (
+    "id",
+    "url",
+    "author",
+    "name",
+    "apkUrls",
+    "otherAssetUrls",
+    "preferredApkIndex",
+    "additionalSettings",
+    "categories",
+    "overrideSource",
+    "allowIdChange",
+)
+
+
+def make_obtainium_link(app):
+    """Return the "add to Obtainium" redirect URL for one app entry.
+
+    Keys whose value is None are omitted; Obtainium treats a missing key
+    the same as an explicit null, and the payload percent-encodes smaller.
+    """
+    payload = {k: v for k in _PAYLOAD_FIELDS if (v := app.get(k)) is not None}
+    if "categories" in payload:
+        payload["categories"] = tuple(payload["categories"])
+    return _encode(app.get("id"), tuple(payload.items()))
+
+
+# One anchored scan per line instead of a strip/partition/strip chain;
+# also constrains keys to identifier shape, as a .env should be.
+_ENV_RE = re.compile(r"""^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*["']?(.*?)["']?\s*$""")
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_dotenv(path, mtime_ns):
+    """Parse a .env file once per (path, mtime) into a {key: value} dict."""
+    pairs = {}
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    for line in text.splitlines():
+        if not line or line.lstrip().startswith("#"):
+            continue
+        m = _ENV_RE.match(line)
+        if m:
+            pairs[m.group(1)] = m.group(2)
+    return pairs
+
+
+def load_dotenv(path=None):
+    """Load KEY=VALUE pairs from a .env file into os.environ.
+
+    Existing environment variables are never overridden. Missing files are
+    silently ignored so the scripts keep working without a .env.
+    """
+    env_path = str(path or REPO_ROOT / ".env")
+    try:
+        mtime_ns = os.stat(env_path).st_mtime_ns
+    except OSError:
+        return
+    pairs = _parse_dotenv(env_path, mtime_ns)
+    missing = {k: v for k, v in pairs.items() if k not in os.environ}
+    if missing:
+        os.environ.update(missing)
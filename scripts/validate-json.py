@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Validate src/applications.json entries against the pack's conventions."""
+
+import hashlib
+import json
+import re
+import sys
+
+from constants import (
+    COMMON_SETTINGS_KEYS,
+    REGEX_SETTINGS_KEYS,
+    SOURCE_SPECIFIC_KEYS,
+    VALID_SOURCES,
+    compile_setting_regex,
+    source_for_url,
+)
+from help_formatter import YELLOW, RESET
+from utils import _EMPTY, _dumps, APPLICATIONS_JSON, REPO_ROOT, include_flags
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # streaming is optional; fall back to a full load
+    ijson = None
+
+_loads = json.loads if orjson is None else orjson.loads
+
+REQUIRED_FIELDS = frozenset({"id", "url", "author", "name", "additionalSettings"})
+
+VALID_META_KEYS = frozenset({"displayName", "excludeFromTable", "excludeFromExport", "devices"})
+
+# Mistakes we have actually seen in review, mapped to the intended key.
+META_TYPO_MAP = {
+    "display_name": "displayName",
+    "displayname": "displayName",
+    "excludeFromTables": "excludeFromTable",
+    "excludefromexport": "excludeFromExport",
+    "device": "devices",
+}
+
+
+def _validate_required_fields(app, app_name, errors):
+    # One set difference instead of a membership probe per field; sorted
+    # so the report order is stable.
+    for field in sorted(REQUIRED_FIELDS.difference(app)):
+        errors.append(f"{app_name}: missing required field '{field}'")
+
+
+def _validate_meta(meta, app_name, errors):
+    for key in meta:
+        if key in META_TYPO_MAP:
+            errors.append(f"{app_name}: meta key '{key}' should be '{META_TYPO_MAP[key]}'")
+        elif key not in VALID_META_KEYS:
+            errors.append(f"{app_name}: unknown meta key '{key}'")
+
+
+# The validators only need scheme and host; one anchored match replaces
+# urlparse's full split with its scheme normalization and caching layers.
+_SCHEME_HOST_RE = re.compile(r"^([a-zA-Z][a-zA-Z0-9+\-.]*)://([^/?#]*)")
+
+
+def _fast_split(url):
+    """(scheme, host) of *url* lowercased, or (None, None) without either."""
+    m = _SCHEME_HOST_RE.match(url)
+    return (m.group(1).lower(), m.group(2).lower()) if m else (None, None)
+
+
+def _validate_url(url, app_name, errors):
+    if not url:
+        return  # absence is _validate_required_fields' problem
+    scheme, host = _fast_split(url)
+    if scheme not in ("http", "https"):
+        errors.append(f"{app_name}: url '{url}' must be http(s)")
+    elif not host:
+        errors.append(f"{app_name}: url '{url}' has no host")
+
+
+def _detect_source_from_url(url):
+    """Best-effort source detection from the url host, None when unknown.
+
+    Delegates to the cached reversed-label trie in constants, which walks
+    host labels right to left — a www. (or any other) subdomain falls out
+    of the walk instead of needing a prefix strip.
+    """
+    return source_for_url(url) if url else None
+
+
+def _validate_override_source(source, url, app_name, errors, warnings):
+    if source is None:
+        return
+    if source not in VALID_SOURCES:
+        errors.append(f"{app_name}: unknown overrideSource '{source}'")
+        return
+    detected = _detect_source_from_url(url)
+    if detected == source and source != "HTML":
+        # An explicit HTML override is never redundant: Obtainium only
+        # infers real forges from the host, HTML is our catch-all.
+        warnings.append(
+            f"{app_name}: overrideSource '{source}' is redundant; "
+            "the url already detects as that source"
+        )
+
+
+def _check_regex(pattern, key, app_name, errors):
+    """*pattern* is known non-empty; the caller filters blanks out."""
+    try:
+        # Cached: apps reuse the same handful of filter patterns, and the
+        # testers compile through this cache too.
+        compile_setting_regex(pattern)
+    except re.error as exc:
+        errors.append(f"{app_name}: invalid regex in '{key}': {exc}")
+
+
+# Indexed once at import: the full valid-key set per source, and which
+# sources own each source-specific key. The per-unknown-key scan over
+# SOURCE_SPECIFIC_KEYS becomes a dict lookup.
+_VALID_KEYS_BY_SOURCE = {
+    source: COMMON_SETTINGS_KEYS | SOURCE_SPECIFIC_KEYS.get(source, frozenset())
+    for source in VALID_SOURCES
+}
+_KEY_TO_SOURCES = {}
+for _source, _keys in SOURCE_SPECIFIC_KEYS.items():
+    for _key in _keys:
+        _KEY_TO_SOURCES.setdefault(_key, []).append(_source)
+del _source, _keys, _key
+
+# Tuple once; iterating a frozenset per app re-hashes its entries.
+_REGEX_KEYS_TUP = tuple(REGEX_SETTINGS_KEYS)
+
+
+def _validate_additional_settings(raw, override, url, app_name, errors, warnings):
+    if raw is None:
+        return
+    if not isinstance(raw, str):
+        errors.append(f"{app_name}: additionalSettings must be a JSON string")
+        return
+    stripped = raw.strip()
+    if not stripped or stripped == "{}":
+        # Nothing to validate; skip the parse entirely. An empty-but-not-
+        # object payload like "[]" still goes through and errors below.
+        return
+    try:
+        settings = _loads(raw)
+    except ValueError as exc:
+        errors.append(f"{app_name}: additionalSettings is not valid JSON: {exc}")
+        return
+    if not isinstance(settings, dict):
+        errors.append(f"{app_name}: additionalSettings must encode an object")
+        return
+    effective_source = override or _detect_source_from_url(url) or "HTML"
+    valid_keys = _VALID_KEYS_BY_SOURCE.get(effective_source, COMMON_SETTINGS_KEYS)
+    for key in settings:
+        if key not in valid_keys:
+            belongs_to = [
+                s for s in _KEY_TO_SOURCES.get(key, ()) if s != effective_source
+            ]
+            if belongs_to:
+                warnings.append(
+                    f"{app_name}: setting '{key}' only applies to "
+                    f"{', '.join(sorted(belongs_to))}, not {effective_source}"
+                )
+            else:
+                warnings.append(f"{app_name}: unknown setting '{key}'")
+    for key in _REGEX_KEYS_TUP:
+        value = settings.get(key)
+        if value and isinstance(value, str):
+            _check_regex(value, key, app_name, errors)
+
+
+def validate_app(app, index):
+    """Validate one app entry; returns (errors, warnings).
+
+    One errors/warnings pair is allocated here and every helper appends
+    into it in place — no per-helper throwaway lists to merge.
+    """
+    # Hoisted once here; each helper used to re-fetch (and re-default)
+    # the same fields.
+    app_name = app.get("id") or app.get("name") or f"apps[{index}]"
+    meta = app.get("meta") or _EMPTY
+    url = app.get("url", "")
+    override = app.get("overrideSource")
+    errors, warnings = [], []
+    _validate_required_fields(app, app_name, errors)
+    _validate_meta(meta, app_name, errors)
+    _validate_url(url, app_name, errors)
+    _validate_override_source(override, url, app_name, errors, warnings)
+    _validate_additional_settings(
+        app.get("additionalSettings"), override, url, app_name, errors, warnings
+    )
+    return errors, warnings
+
+
+def check_duplicate_ids(apps):
+    """Ids that would collide within either exported pack, in one pass."""
+    errors = []
+    seen_std, seen_ds = set(), set()
+    for app in apps:
+        if (app.get("meta") or _EMPTY).get("excludeFromExport"):
+            continue
+        in_std, in_ds = include_flags(app)
+        app_id = app.get("id")
+        if in_std:
+            if app_id in seen_std:
+                errors.append(f"duplicate id '{app_id}' in the standard export")
+            seen_std.add(app_id)
+        if in_ds:
+            if app_id in seen_ds:
+                errors.append(f"duplicate id '{app_id}' in the dual-screen export")
+            seen_ds.add(app_id)
+    return errors
+
+
+# Below this app count, worker startup costs more than validation saves.
+_PARALLEL_THRESHOLD = 200
+
+# Findings per app-content digest persist across runs: in CI most apps
+# are unchanged commit to commit and skip validation entirely.
+_CACHE_PATH = REPO_ROOT / ".cache" / "validate.json"
+
+# The digests are keyed with a fingerprint of the rule inputs, so editing
+# the schema or the meta-key tables orphans every cached finding instead
+# of serving stale ones. Bump _RULES_VERSION for logic changes the
+# inputs below do not capture.
+_RULES_VERSION = 1
+_RULES_KEY = hashlib.blake2b(
+    json.dumps([
+        _RULES_VERSION,
+        sorted(REQUIRED_FIELDS),
+        sorted(VALID_META_KEYS),
+        sorted(META_TYPO_MAP.items()),
+        sorted(VALID_SOURCES),
+        sorted(COMMON_SETTINGS_KEYS),
+        [[s, sorted(keys)] for s, keys in sorted(SOURCE_SPECIFIC_KEYS.items())],
+        sorted(REGEX_SETTINGS_KEYS),
+    ], separators=(",", ":")).encode("utf-8"),
+    digest_size=32,
+).digest()
+
+if orjson is not None:
+    def _app_digest(app):
+        return hashlib.blake2b(
+            orjson.dumps(app, option=orjson.OPT_SORT_KEYS),
+            digest_size=16, key=_RULES_KEY,
+        ).hexdigest()
+else:
+    def _app_digest(app):
+        payload = json.dumps(app, sort_keys=True, separators=(",", ":"))
+        return hashlib.blake2b(
+            payload.encode("utf-8"), digest_size=16, key=_RULES_KEY
+        ).hexdigest()
+
+
+def _load_validation_cache():
+    try:
+        with open(_CACHE_PATH, "rb") as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_validation_cache(cache):
+    try:
+        _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _CACHE_PATH.write_bytes(_dumps(cache))
+    except OSError:
+        pass  # caching is best-effort; a read-only checkout just disables it
+
+
+def _validate_entry(pair):
+    """Picklable per-app worker for the process pool."""
+    i, app = pair
+    return validate_app(app, i)
+
+
+def _iter_apps(path):
+    """Yield apps one at a time; streams with ijson when it is available."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "apps.item")
+        else:
+            yield from _loads(f.read()).get("apps", [])
+
+
+def validate_json(path=None):
+    """Validate the whole file; returns (errors, warnings)."""
+    cache = _load_validation_cache()
+    fresh = {}
+    results = {}
+    # The duplicate check only needs id and meta, so the streaming pass
+    # keeps just those instead of holding every parsed app alive.
+    id_views = []
+    pending = []
+    for i, app in enumerate(_iter_apps(path or APPLICATIONS_JSON)):
+        id_views.append({"id": app.get("id"), "meta": app.get("meta")})
+        key = _app_digest(app)
+        hit = cache.get(key)
+        if hit is not None:
+            results[i] = hit
+            fresh[key] = hit
+        else:
+            pending.append((i, key, app))
+
+    # Per-app validation is pure CPU (regex, url, JSON decode), so big
+    # catalogs fan out across cores while small ones skip pool startup.
+    if len(pending) > _PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as ex:
+            outcomes = list(
+                ex.map(_validate_entry, [(i, app) for i, _, app in pending], chunksize=32)
+            )
+    else:
+        outcomes = [_validate_entry((i, app)) for i, _, app in pending]
+    for (i, key, _), outcome in zip(pending, outcomes):
+        results[i] = outcome
+        fresh[key] = outcome
+    # Writing only this run's digests also prunes entries for apps that
+    # have since changed or left the catalog.
+    _store_validation_cache(fresh)
+
+    all_errors, all_warnings = [], []
+    for i in sorted(results):
+        errors, warnings = results[i]
+        all_errors += errors
+        all_warnings += warnings
+    all_errors += check_duplicate_ids(id_views)
+    return all_errors, all_warnings
+
+
+def main():
+    errors, warnings = validate_json(sys.argv[1] if len(sys.argv) > 1 else None)
+    for warning in warnings:
+        print(f"{YELLOW}warning:{RESET} {warning}")
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+    if errors:
+        print(f"\n{len(errors)} error(s), {len(warnings)} warning(s)", file=sys.stderr)
+        return 1
+    print(f"OK ({len(warnings)} warning(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())